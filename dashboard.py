@@ -1,54 +1,158 @@
 # dashboard.py
 import streamlit as st
-import json
-import pandas as pd
+import math
+from collections import defaultdict
+
+import ijson
 
 # --- Data Loading ---
-# Assume the JSON data is saved in 'analysis_data.json' in the same directory
-try:
-    with open('cross_document_analysis_data.json', 'r') as f:
-        data = json.load(f)
-except FileNotFoundError:
-    st.error("Error: cross_document_analysis_data.json.json not found. Please ensure the JSON data is saved in this file.")
-    st.stop() # Stop execution if file not found
-except json.JSONDecodeError:
-    st.error("Error: Could not decode cross_document_analysis_data.json.json. Please ensure it's valid JSON.")
-    st.stop() # Stop execution if JSON is invalid
-
-# Extract main sections for easier access
-doc_structure = data.get('document_structure', {})
-term_analysis = data.get('terminology_analysis', {})
-compliance = data.get('best_practices_compliance', {})
-redundancy = data.get('redundancy_and_gaps', {})
-recommendations = data.get('recommendations', [])
-summary = data.get('summary', "No summary provided.")
-
-# List of document names for selection
-doc_names = list(doc_structure.keys())
+DATA_PATH = 'cross_document_analysis_data.json'
+
+
+@st.cache_data(show_spinner=False)
+def load_section(path, key, default):
+    # Stream just this top-level key instead of decoding the whole file;
+    # each section is parsed once and reused across reruns
+    with open(path, 'rb') as f:
+        return next(ijson.items(f, key, use_float=True), default)
+
+
+def section(key, default):
+    try:
+        return load_section(DATA_PATH, key, default)
+    except FileNotFoundError:
+        st.error(f"Error: {DATA_PATH} not found. Please ensure the JSON data is saved in this file.")
+        st.stop() # Stop execution if file not found
+    except ijson.JSONError:
+        st.error(f"Error: Could not decode {DATA_PATH}. Please ensure it's valid JSON.")
+        st.stop() # Stop execution if JSON is invalid
+
+
+@st.cache_data(show_spinner=False)
+def normalize_redundancy(redundancy):
+    # Ensure every overlap's 'documents' is a list so it can be joined with .str.join
+    overlaps = []
+    for overlap in redundancy.get('overlaps', []):
+        documents = overlap.get('documents') or []
+        if isinstance(documents, str):
+            documents = [documents]
+        overlaps.append({**overlap, 'documents': list(documents)})
+    return {**redundancy, 'overlaps': overlaps}
+
+
+@st.cache_data(show_spinner=False)
+def build_compliance_index(compliance):
+    # Invert {practice: {compliant, non_compliant}} into {doc: {practice: (is_compliant, reason)}}
+    idx = defaultdict(dict)
+    for practice, details in compliance.items():
+        for doc in details.get('compliant', []):
+            idx[doc][practice] = (True, None)
+        # Non-compliant entries take precedence over compliant ones
+        for item in details.get('non_compliant', []):
+            if isinstance(item, dict):
+                idx[item.get('file')][practice] = (False, item.get('reason', 'No specific reason provided.'))
+            else:
+                idx[item][practice] = (False, 'N/A')
+    return dict(idx)
+
+
+@st.cache_data(show_spinner=False)
+def docs_to_terms(terms_dict):
+    # Invert {term: {documents: [...]}} into {doc: [terms]}
+    out = defaultdict(list)
+    for term, details in terms_dict.items():
+        for doc in details.get('documents', []):
+            out[doc].append(term)
+    return dict(out)
+
+
+@st.cache_data(show_spinner=False)
+def build_doc_stats(doc_structure):
+    # Per-document metrics so the Document Explorer is a single dict lookup
+    doc_stats = {}
+    for doc, doc_data in doc_structure.items():
+        headings = doc_data.get('headings', {})
+        section_lengths = doc_data.get('section_lengths') or []
+        doc_stats[doc] = {
+            'h1': headings.get('H1', 0),
+            'h2': headings.get('H2', 0),
+            'num_sections': len(section_lengths),
+            'avg_section_len': (sum(section_lengths) / len(section_lengths)) if section_lengths else 0,
+            'flags': {
+                "Lists Present": doc_data.get('lists', False),
+                "Tables Present": doc_data.get('tables', False),
+                "FAQs Present": doc_data.get('faqs', False),
+                "Metadata Present": doc_data.get('metadata', False)
+            },
+        }
+    return doc_stats
 
-# --- Sidebar Navigation ---
-st.sidebar.title("Navigation")
-page = st.sidebar.radio("Go to", [
-    "Overview",
-    "Document Explorer",
-    "Terminology Hub",
-    "Compliance Dashboard",
-    "Redundancy & Gaps",
-    "Recommendations"
-])
 
-st.sidebar.markdown("---") # Separator
-st.sidebar.info("This dashboard visualizes the analysis of your documentation.")
+# --- Cached Table Builders ---
+@st.cache_data(show_spinner=False)
+def make_glossary_df(glossary):
+    import pandas as pd
+
+    return pd.DataFrame(glossary.items(), columns=['Term', 'Definition'])
+
+
+@st.cache_data(show_spinner=False)
+def make_synonyms_df(synonyms):
+    import pandas as pd
+
+    # Convert dict to list of dicts for DataFrame
+    return pd.DataFrame([{'Term': k, 'Synonyms': ', '.join(v)} for k, v in synonyms.items()])
+
+
+@st.cache_data(show_spinner=False)
+def make_freq_df(terms_data):
+    import pandas as pd
+
+    freq_data = [{'Term': term, 'Frequency': details.get('frequency', 0)} for term, details in terms_data.items()]
+    return pd.DataFrame(freq_data).sort_values(by='Frequency', ascending=False)
+
+
+@st.cache_data(show_spinner=False)
+def make_incons_df(inconsistencies):
+    import pandas as pd
+
+    return pd.DataFrame(inconsistencies)
+
+
+@st.cache_data(show_spinner=False)
+def compliant_html(docs_tuple):
+    # Make list scrollable if long
+    return "<div style='height:100px;overflow-y:scroll;border:1px solid lightgray;padding:5px;'>" + "<br>".join(docs_tuple) + "</div>"
+
 
 # --- Page Content ---
+# Each page is a fragment, so in-page widget changes rerun only that page
+
+
+def paginated(df, key, page_size=50):
+    # Only ship one page of rows to the browser; small tables render as before
+    if len(df) <= page_size:
+        st.dataframe(df, use_container_width=True)
+        return
+    num_pages = math.ceil(len(df) / page_size)
+    page = st.number_input(f"Page (of {num_pages})", 1, num_pages, key=key)
+    st.dataframe(df.iloc[(page - 1) * page_size: page * page_size], use_container_width=True)
+
+
+@st.fragment
+def render_overview():
+    summary = section('summary', "No summary provided.")
+    doc_structure = section('document_structure', {})
+    term_analysis = section('terminology_analysis', {})
+    compliance = section('best_practices_compliance', {})
+    recommendations = section('recommendations', [])
 
-if page == "Overview":
     st.title("Documentation Analysis Overview")
     st.markdown("### Summary")
     st.write(summary)
 
     st.markdown("### Key Statistics")
-    num_docs = len(doc_names)
+    num_docs = len(doc_structure)
     num_terms = len(term_analysis.get('terms', {}))
     num_inconsistencies = len(term_analysis.get('inconsistencies', []))
     num_recommendations = len(recommendations)
@@ -61,52 +165,62 @@ if page == "Overview":
     col1.metric("Compliance Areas Checked", num_compliance_areas)
     col2.metric("Recommendations Made", num_recommendations)
 
-elif page == "Document Explorer":
+
+@st.fragment
+def render_doc_explorer():
+    import pandas as pd
+
+    doc_structure = section('document_structure', {})
+    doc_stats = build_doc_stats(doc_structure)
+    # List of document names for selection
+    doc_names = list(doc_structure.keys())
+
     st.title("Document Explorer")
     selected_doc = st.selectbox("Select a Document", doc_names)
 
     if selected_doc and selected_doc in doc_structure:
         st.markdown(f"### Details for: `{selected_doc}`")
-        doc_data = doc_structure[selected_doc]
+        stats = doc_stats[selected_doc]
 
         # Display Structure
         st.subheader("Structure")
         cols = st.columns(2)
-        cols[0].metric("H1 Headings", doc_data.get('headings', {}).get('H1', 0))
-        cols[0].metric("H2 Headings", doc_data.get('headings', {}).get('H2', 0))
-        cols[1].metric("Sections", len(doc_data.get('section_lengths', [])))
-        avg_len = sum(doc_data.get('section_lengths', [0])) / len(doc_data.get('section_lengths', [1]))
-        cols[1].metric("Avg Section Length (Tokens)", f"{avg_len:.0f}")
-
-        flags = {
-            "Lists Present": doc_data.get('lists', False),
-            "Tables Present": doc_data.get('tables', False),
-            "FAQs Present": doc_data.get('faqs', False),
-            "Metadata Present": doc_data.get('metadata', False)
-        }
-        st.write("**Features:**")
-        st.json(flags) # Simple way to show boolean flags
+        cols[0].metric("H1 Headings", stats['h1'])
+        cols[0].metric("H2 Headings", stats['h2'])
+        cols[1].metric("Sections", stats['num_sections'])
+        cols[1].metric("Avg Section Length (Tokens)", f"{stats['avg_section_len']:.0f}")
 
+        st.write("**Features:**")
+        flag_cols = st.columns(2)
+        for i, (label, present) in enumerate(stats['flags'].items()):
+            flag_cols[i % 2].checkbox(label, value=bool(present), disabled=True)
+
+
+        # Reuse this document's computed state across reruns until refreshed
+        cache_key = f'doc_cache::{selected_doc}'
+        if st.button("Refresh", key='doc_refresh'):
+            st.session_state.pop(cache_key, None)
+        if cache_key not in st.session_state:
+            compliance = section('best_practices_compliance', {})
+            compliance_index = build_compliance_index(compliance)
+            doc_to_terms = docs_to_terms(section('terminology_analysis', {}).get('terms', {}))
+            doc_compliance = compliance_index.get(selected_doc, {})
+            compliance_issues = []
+            for practice in compliance:
+                is_compliant, reason = doc_compliance.get(practice, (False, "Not explicitly listed as non-compliant"))
+                # Store issue if not compliant
+                if not is_compliant:
+                    compliance_issues.append({"Practice": practice.replace('_', ' ').title(), "Reason": reason})
+            st.session_state[cache_key] = {
+                'compliance_issues': compliance_issues,
+                'found_terms': doc_to_terms.get(selected_doc, []),
+            }
+        doc_cache = st.session_state[cache_key]
+        compliance_issues = doc_cache['compliance_issues']
+        found_terms = doc_cache['found_terms']
 
         # Display Compliance Status
         st.subheader("Compliance Status")
-        compliance_issues = []
-        for practice, details in compliance.items():
-            is_compliant = False
-            reason = "Not explicitly listed as non-compliant"
-            # Check if doc is in compliant list
-            if selected_doc in details.get('compliant', []):
-                is_compliant = True
-            # Check if doc is in non-compliant list
-            for item in details.get('non_compliant', []):
-                if isinstance(item, dict) and item.get('file') == selected_doc:
-                    is_compliant = False
-                    reason = item.get('reason', 'No specific reason provided.')
-                    break
-            # Store issue if not compliant
-            if not is_compliant:
-                compliance_issues.append({"Practice": practice.replace('_', ' ').title(), "Reason": reason})
-
         if compliance_issues:
             st.warning("This document has compliance issues:")
             df_compliance = pd.DataFrame(compliance_issues)
@@ -114,35 +228,32 @@ elif page == "Document Explorer":
         else:
             st.success("This document appears compliant with all checked best practices.")
 
-        # Display Terms Found (Optional - can be slow if many terms)
+        # Display Terms Found
         st.subheader("Relevant Terms")
-        found_terms = []
-        for term, details in term_analysis.get('terms', {}).items():
-            if selected_doc in details.get('documents', []):
-                found_terms.append(term)
         if found_terms:
             st.write(", ".join(found_terms))
         else:
             st.write("No specific tracked terms were listed for this document.")
 
 
-elif page == "Terminology Hub":
+@st.fragment
+def render_terminology():
+    term_analysis = section('terminology_analysis', {})
+
     st.title("Terminology Hub")
 
     st.subheader("Glossary")
     glossary = term_analysis.get('glossary', {})
     if glossary:
-        df_glossary = pd.DataFrame(glossary.items(), columns=['Term', 'Definition'])
-        st.dataframe(df_glossary, use_container_width=True)
+        df_glossary = make_glossary_df(glossary)
+        paginated(df_glossary, key='glossary_page')
     else:
         st.write("No glossary provided.")
 
     st.subheader("Synonym Map")
     synonyms = term_analysis.get('synonym_map', {})
     if synonyms:
-         # Convert dict to list of dicts for DataFrame
-        syn_list = [{'Term': k, 'Synonyms': ', '.join(v)} for k, v in synonyms.items()]
-        df_synonyms = pd.DataFrame(syn_list)
+        df_synonyms = make_synonyms_df(synonyms)
         st.dataframe(df_synonyms, use_container_width=True)
     else:
         st.write("No synonym map provided.")
@@ -150,9 +261,8 @@ elif page == "Terminology Hub":
     st.subheader("Term Frequency")
     terms_data = term_analysis.get('terms', {})
     if terms_data:
-        freq_data = [{'Term': term, 'Frequency': details.get('frequency', 0)} for term, details in terms_data.items()]
-        df_freq = pd.DataFrame(freq_data).sort_values(by='Frequency', ascending=False)
-        st.dataframe(df_freq, use_container_width=True)
+        df_freq = make_freq_df(terms_data)
+        paginated(df_freq, key='freq_page')
         # Optional: Add a bar chart
         # st.bar_chart(df_freq.set_index('Term'))
     else:
@@ -162,13 +272,18 @@ elif page == "Terminology Hub":
     inconsistencies = term_analysis.get('inconsistencies', [])
     if inconsistencies:
         st.warning("The following terminology inconsistencies were noted:")
-        df_incons = pd.DataFrame(inconsistencies)
+        df_incons = make_incons_df(inconsistencies)
         st.dataframe(df_incons, use_container_width=True)
     else:
         st.success("No terminology inconsistencies listed.")
 
 
-elif page == "Compliance Dashboard":
+@st.fragment
+def render_compliance():
+    import pandas as pd
+
+    compliance = section('best_practices_compliance', {})
+
     st.title("Best Practices Compliance Dashboard")
 
     if not compliance:
@@ -181,8 +296,7 @@ elif page == "Compliance Dashboard":
                 compliant_docs = details.get('compliant', [])
                 if compliant_docs:
                     st.write(f"`{len(compliant_docs)}` document(s):")
-                    # Make list scrollable if long
-                    st.markdown(f"<div style='height:100px;overflow-y:scroll;border:1px solid lightgray;padding:5px;'>{'<br>'.join(compliant_docs)}</div>", unsafe_allow_html=True)
+                    st.markdown(compliant_html(tuple(compliant_docs)), unsafe_allow_html=True)
                 else:
                     st.info("No documents explicitly listed as compliant.")
 
@@ -190,28 +304,30 @@ elif page == "Compliance Dashboard":
                 non_compliant_info = details.get('non_compliant', [])
                 if non_compliant_info:
                     st.write(f"`{len(non_compliant_info)}` document(s):")
-                    # Process non-compliant which might be list of dicts
-                    non_compliant_data = []
-                    for item in non_compliant_info:
-                        if isinstance(item, dict):
-                             non_compliant_data.append({'Document': item.get('file'), 'Reason': item.get('reason')})
-                        else: # Handle if it's just a list of filenames (though schema suggests dict)
-                             non_compliant_data.append({'Document': item, 'Reason': 'N/A'})
-
-                    df_noncompliant = pd.DataFrame(non_compliant_data)
-                    st.dataframe(df_noncompliant, use_container_width=True)
+                    # Process non-compliant which might be list of dicts (or bare filenames)
+                    rows = [item if isinstance(item, dict) else {'file': item} for item in non_compliant_info]
+                    df_noncompliant = (pd.DataFrame(rows)
+                                       .reindex(columns=['file', 'reason'])
+                                       .rename(columns={'file': 'Document', 'reason': 'Reason'}))
+                    df_noncompliant['Reason'] = df_noncompliant['Reason'].fillna('N/A')
+                    paginated(df_noncompliant, key=f'noncompliant_page::{practice}')
                 else:
                     st.info("No documents explicitly listed as non-compliant.")
 
 
-elif page == "Redundancy & Gaps":
+@st.fragment
+def render_redundancy():
+    import pandas as pd
+
+    redundancy = normalize_redundancy(section('redundancy_and_gaps', {}))
+
     st.title("Redundancy Analysis and Information Gaps")
 
     st.subheader("Overlapping Topics")
     overlaps = redundancy.get('overlaps', [])
     if overlaps:
         df_overlaps = pd.DataFrame(overlaps)
-        df_overlaps['documents'] = df_overlaps['documents'].apply(lambda x: ', '.join(x)) # Make list readable
+        df_overlaps['documents'] = df_overlaps['documents'].str.join(', ') # Make list readable
         st.dataframe(df_overlaps, use_container_width=True)
     else:
         st.info("No specific topic overlaps were identified.")
@@ -235,7 +351,10 @@ elif page == "Redundancy & Gaps":
         st.info("No specific information gaps were listed.")
 
 
-elif page == "Recommendations":
+@st.fragment
+def render_recommendations():
+    recommendations = section('recommendations', [])
+
     st.title("Recommendations for Improvement")
 
     if recommendations:
@@ -243,4 +362,24 @@ elif page == "Recommendations":
         for i, rec in enumerate(recommendations):
             st.markdown(f"{i+1}. {rec}")
     else:
-        st.info("No specific recommendations were provided in the data.")
\ No newline at end of file
+        st.info("No specific recommendations were provided in the data.")
+
+
+PAGES = {
+    "Overview": render_overview,
+    "Document Explorer": render_doc_explorer,
+    "Terminology Hub": render_terminology,
+    "Compliance Dashboard": render_compliance,
+    "Redundancy & Gaps": render_redundancy,
+    "Recommendations": render_recommendations,
+}
+
+# --- Sidebar Navigation ---
+st.sidebar.title("Navigation")
+page = st.sidebar.radio("Go to", list(PAGES))
+
+st.sidebar.markdown("---") # Separator
+st.sidebar.info("This dashboard visualizes the analysis of your documentation.")
+
+# Only the selected page's logic (and its pandas import) runs
+PAGES[page]()